@@ -1,16 +1,33 @@
 # app.py (Git-backed, with safe_rerun)
-import io
-import re
-import base64
-from typing import List, Optional
+import html
+import functools
 
+import numpy as np
 import pandas as pd
+import pyarrow.compute as pc
 import streamlit as st
 
-try:
-    import requests
-except Exception:
-    requests = None
+from catalog_core import (
+    card_fields,
+    cell_text,
+    clear_source_caches,
+    download_url_ok,
+    fragment,
+    frame_key,
+    fuzzy_matches,
+    load_catalog,
+    page_positions,
+    page_records,
+    safe_rerun,
+    search_form,
+    select_software,
+    software_names,
+    table_view,
+    view_mode_radio,
+)
+
+CARD_FIELDS = ("Software", "License", "Version", "Category", "Platform", "Description")
+DESCRIPTION_MAX_LEN = 140  # card descriptions longer than this are cut with "…"
 
 # ---------------------------
 # Page config
@@ -19,112 +36,76 @@ st.set_page_config(page_title="Software Catalog", page_icon="🧩", layout="wide
 st.title("🧩 Software Catalog")
 st.caption("Loads Excel from Git on startup. Browse all software as cards, search, and view full details with a download button.")
 
-# ---------------------------
-# Rerun helper (works across Streamlit versions)
-# ---------------------------
-
-def safe_rerun(scope: str = "app"):
-    """Call st.rerun if available; fall back to st.experimental_rerun for old versions."""
-    try:
-        # Streamlit >= 1.27
-        st.rerun(scope=scope)
-    except Exception:
-        # Older Streamlit (<1.27) fallback
-        try:
-            st.experimental_rerun()
-        except Exception:
-            # As a last resort, do nothing
-            pass
-
 # ---------------------------
 # Helpers
 # ---------------------------
 
-def normalize_col(name: str) -> str:
-    return re.sub(r"\s+", " ", str(name).strip().lower())
-
-def coerce_to_software_column(df: pd.DataFrame) -> pd.DataFrame:
-    norm_map = {normalize_col(c): c for c in df.columns}
-    if "software" in norm_map:
-        orig = norm_map["software"]
-        if orig != "Software":
-            df = df.rename(columns={orig: "Software"})
-        return df
-    if "component" in norm_map:
-        return df.rename(columns={norm_map["component"]: "Software"})
-    for key in ["name", "item", "asset", "module", "service", "application", "app name", "product"]:
-        if key in norm_map:
-            return df.rename(columns={norm_map[key]: "Software"})
-    return df
-
-def unique_software(df: pd.DataFrame) -> List[str]:
-    return (
-        df["Software"].dropna().astype(str).map(str.strip)
-          .replace("", pd.NA).dropna().drop_duplicates()
-          .sort_values(kind="mergesort").tolist()
-    )
-
 def link_button(label: str, url: str, use_container_width: bool = True):
     try:
         st.link_button(label, url, use_container_width=use_container_width)
     except Exception:
-        html = (
+        markup = (
             '<a href="{url}" target="_blank" '
             'style="text-decoration:none;background:#0969da;color:white;'
             'padding:0.5rem 0.75rem;border-radius:0.5rem;display:inline-block;'
             'text-align:center;font-weight:600;">{label}</a>'
         ).format(url=url, label=label)
-        st.markdown(html, unsafe_allow_html=True)
-
-def badge(text: str, color: str = "gray"):
-    colors = {
-        "green": "#2da44e", "red": "#d1242f", "blue": "#0969da", "gray": "#6e7781",
-        "orange": "#c9510c", "violet": "#8250df", "pink": "#bf3989"
-    }
-    hexcolor = colors.get(color, color)
-    bg = hexcolor + "20"
-    bd = hexcolor + "40"
-    html = (
-        "<span style='display:inline-block;padding:2px 8px;border-radius:999px;"
-        "font-size:12px;font-weight:600;background:{bg};color:{fg};"
-        "border:1px solid {bd}'>{text}</span>"
-    ).format(bg=bg, fg=hexcolor, bd=bd, text=text)
-    st.markdown(html, unsafe_allow_html=True)
+        st.markdown(markup, unsafe_allow_html=True)
+
+BADGE_COLORS = {
+    "green": "#2da44e", "red": "#d1242f", "blue": "#0969da", "gray": "#6e7781",
+    "orange": "#c9510c", "violet": "#8250df", "pink": "#bf3989"
+}
+
+# Card styles are sent once per run; each card then only carries class names
+CARD_CSS = "<style>{rules}</style>".format(rules="".join([
+    ".sc-grid{display:grid;grid-template-columns:repeat(var(--cols),minmax(0,1fr));gap:1rem}",
+    ".sc-card{border:1px solid #e5e7eb;border-radius:10px;padding:12px 14px;height:100%}",
+    ".sc-card h3{margin:0 0 4px 0;padding:0}",
+    ".sc-meta{color:#6b7280;font-size:14px}",
+    ".sc-badges{display:flex;flex-wrap:wrap;gap:8px;margin:8px 0}",
+    ".sc-badge{display:inline-block;padding:2px 8px;border-radius:999px;font-size:12px;font-weight:600}",
+    ".sc-desc{font-size:14px}",
+] + [
+    ".sc-badge.{n}{{background:{c}20;color:{c};border:1px solid {c}40}}".format(n=name, c=hexcolor)
+    for name, hexcolor in BADGE_COLORS.items()
+]))
+
+@functools.lru_cache(maxsize=512)
+def _badge_html(text: str, color: str = "gray") -> str:
+    # Versions/licenses repeat across cards, so most calls are cache hits
+    if color in BADGE_COLORS:
+        return "<span class='sc-badge {c}'>{text}</span>".format(c=color, text=html.escape(text))
+    return "<span class='sc-badge' style='background:{c}20;color:{c};border:1px solid {c}40'>{text}</span>".format(
+        c=color, text=html.escape(text)
+    )
+
+def card_html(row: dict) -> str:
+    # `row` holds the preformatted strings from card_fields()
+    license_val = row["License"]
+    meta = " • ".join([x for x in [row["Category"], row["Platform"]] if x and x != "—"])
+    parts = [
+        "<div class='sc-card'>",
+        "<h3>{t}</h3>".format(t=html.escape(row["Software"])),
+    ]
+    if meta:
+        parts.append("<div class='sc-meta'>{m}</div>".format(m=html.escape(meta)))
+    parts.append("<div class='sc-badges'>{v}{l}</div>".format(
+        v=_badge_html("Version: {v}".format(v=row["Version"]), "blue"),
+        l=_badge_html(license_val, "green" if license_val.lower() == "free" else "orange"),
+    ))
+    if row["Description"]:
+        parts.append("<div class='sc-desc'>{d}</div>".format(d=html.escape(row["Description"])))
+    parts.append("</div>")
+    return "".join(parts)
 
 def pretty_kv(label: str, value):
     st.markdown("**{k}:** {v}".format(k=label, v=(value if pd.notna(value) else "-")))
 
 # ---------------------------
-# Data loading from Git
+# Data source
 # ---------------------------
 
-@st.cache_data(ttl=300, show_spinner=True)
-def load_excel_from_public_url(url: str, headers: Optional[dict] = None) -> pd.DataFrame:
-    if requests is None:
-        raise RuntimeError("The 'requests' package is required. Add it to requirements.txt.")
-    r = requests.get(url, headers=headers or {}, timeout=30)
-    r.raise_for_status()
-    content = r.content
-    return pd.read_excel(io.BytesIO(content), dtype=object)
-
-@st.cache_data(ttl=300, show_spinner=True)
-def load_excel_from_github_api(owner: str, repo: str, path: str, ref: Optional[str] = None, token: Optional[str] = None) -> pd.DataFrame:
-    if requests is None:
-        raise RuntimeError("The 'requests' package is required. Add it to requirements.txt.")
-    api_url = "https://api.github.com/repos/{owner}/{repo}/contents/{path}".format(owner=owner, repo=repo, path=path)
-    params = {"ref": ref} if ref else None
-    headers = {"Accept": "application/vnd.github.v3+json"}
-    if token:
-        headers["Authorization"] = "Bearer {t}".format(t=token)
-    resp = requests.get(api_url, headers=headers, params=params, timeout=30)
-    resp.raise_for_status()
-    data = resp.json()
-    if isinstance(data, dict) and data.get("encoding") == "base64" and data.get("content"):
-        b = base64.b64decode(data["content"])
-        return pd.read_excel(io.BytesIO(b), dtype=object)
-    else:
-        raise RuntimeError("Unexpected GitHub API response. Ensure the path points to a file.")
-
 # Determine data source from secrets
 DATA_SOURCE = None
 err_msg = None
@@ -157,7 +138,7 @@ with st.sidebar:
     st.caption("Data is loaded from Git (secrets). Use Refresh to re-fetch and clear cache.")
     refresh = st.button("🔄 Refresh data", use_container_width=True)
     if refresh:
-        st.cache_data.clear()
+        clear_source_caches()
         safe_rerun()
 
     st.divider()
@@ -186,16 +167,16 @@ if DATA_SOURCE is not None:
             url = DATA_SOURCE[1]
             token = DATA_SOURCE[2]
             headers = {"Authorization": "Bearer {t}".format(t=token)} if token else None
-            df = load_excel_from_public_url(url, headers=headers)
+            df = load_catalog("url", {"url": url, "headers": headers})
         else:
             cfg = DATA_SOURCE[1]
-            df = load_excel_from_github_api(
-                owner=cfg["owner"],
-                repo=cfg["repo"],
-                path=cfg["path"],
-                ref=cfg.get("ref"),
-                token=cfg.get("token"),
-            )
+            df = load_catalog("github_api", {
+                "owner": cfg["owner"],
+                "repo": cfg["repo"],
+                "path": cfg["path"],
+                "ref": cfg.get("ref"),
+                "token": cfg.get("token"),
+            })
     except Exception as e:
         load_error = str(e)
 else:
@@ -209,128 +190,124 @@ if load_error:
 # Prepare DataFrame
 # ---------------------------
 
-df.columns = [str(c).strip() for c in df.columns]
-df = coerce_to_software_column(df)
-
 if "Software" not in df.columns:
     st.error("No identifying column found. Please include a column named 'Software' (or 'Component').")
     st.stop()
 
-for col in df.columns:
-    df[col] = df[col].astype(object)
+df_key = frame_key(df)
 
 # ---------------------------
-# Search and Grid
+# Search, Grid and Details
 # ---------------------------
 
-st.subheader("Browse All Software")
-query = st.text_input(
-    "Search by software name (matches within the 'Software' column)",
-    placeholder="e.g., editor, vpn, browser …",
-).strip()
+if "selected_software" not in st.session_state:
+    st.session_state.selected_software = None
 
-if query:
-    mask = df["Software"].astype(str).str.contains(re.escape(query), case=False, na=False)
-    filtered = df[mask].copy()
-else:
-    filtered = df.copy()
 
-filtered = filtered.sort_values(by="Software", kind="mergesort")
-st.caption("Showing {shown} of {total} software".format(shown=len(filtered), total=len(df)))
+@fragment
+def render_catalog(df: pd.DataFrame, df_key: str):
+    """Search, grid and details panel. Widget interactions in here rerun only this
+    fragment, so the source probe and data load above are skipped."""
+    software_arrow, name_index = software_names(df_key, df)
+
+    st.subheader("Browse All Software")
+    query = search_form("Search by software name (matches within the 'Software' column)")
+
+    if query:
+        # Literal substring scan in Arrow's C kernel: no regex compile, no per-element Python
+        mask = pc.match_substring(software_arrow, query.lower()).to_numpy(zero_copy_only=False)
+        if not mask.any():
+            # No literal hit (likely a typo): fall back to the closest names
+            names = list(name_index)
+            for i in fuzzy_matches(names, query):
+                mask[name_index[names[i]]] = True
+            if mask.any():
+                st.caption("No exact matches for \"{q}\" — showing close matches.".format(q=query))
+    else:
+        mask = np.ones(len(df), dtype=bool)
 
-if "selected_software" not in st.session_state:
-    st.session_state.selected_software = None
+    # Matching row positions; the cached frame is already in name order, so no copy or sort
+    filtered_pos = np.flatnonzero(mask)
+    st.caption("Showing {shown} of {total} software".format(shown=len(filtered_pos), total=len(df)))
 
-n_cols = 3
-
-# Render cards
-rows = list(filtered.iterrows())
-for i in range(0, len(rows), n_cols):
-    chunk = rows[i:i+n_cols]
-    cols = st.columns(len(chunk), gap="large")
-    for col_idx, (idx, row) in enumerate(chunk):
-        with cols[col_idx]:
-            try:
-                ctx = st.container(border=True)
-            except TypeError:
-                ctx = st.container()
-            with ctx:
-                title = str(row.get("Software", "—"))
-                license_val = str(row.get("License", "—"))
-                version_val = str(row.get("Version", "—"))
-                category = str(row.get("Category", "—"))
-                platform = str(row.get("Platform", "—"))
-                desc = str(row.get("Description", "") or "")
-
-                st.markdown("### {t}".format(t=title))
-                meta = " • ".join([x for x in [category, platform] if x and x != "—"])
-                if meta:
-                    st.caption(meta)
-
-                b1, b2 = st.columns([1, 1])
-                with b1:
-                    badge("Version: {v}".format(v=version_val), color="blue")
-                with b2:
-                    badge(license_val, color=("green" if license_val.lower() == "free" else "orange"))
-
-                if desc.strip():
-                    st.write(desc if len(desc) < 140 else (desc[:140] + "…"))
-
-                if st.button("View details", key="view_{i}".format(i=idx), use_container_width=True):
-                    st.session_state.selected_software = title
+    if view_mode_radio(len(filtered_pos)) == "Table":
+        pick = table_view(df, df_key, filtered_pos)
+        if pick:
+            st.session_state.selected_software = pick
+    else:
+        n_cols = 3
+
+        page, page_pos = page_positions(filtered_pos, results=query)
+        rows = page_records(card_fields(df_key, df, CARD_FIELDS, DESCRIPTION_MAX_LEN), page_pos)
+        for i in range(0, len(rows), n_cols):
+            chunk = rows[i:i+n_cols]
+            # One markdown element per row of cards; only the buttons remain separate widgets
+            cards = "".join(card_html(row) for _, row in chunk)
+            st.markdown("<div class='sc-grid' style='--cols:{n}'>{c}</div>".format(n=n_cols, c=cards), unsafe_allow_html=True)
+            cols = st.columns(n_cols, gap="small")
+            for col, (pos, row) in zip(cols, chunk):
+                with col:
+                    st.button(
+                        "View details",
+                        key="view_{p}_{i}".format(p=page, i=pos),
+                        use_container_width=True,
+                        on_click=select_software,
+                        args=(df, pos),
+                    )
 
-st.divider()
+    st.divider()
 
-# ---------------------------
-# Details panel
-# ---------------------------
+    # Details panel
+
+    selected = st.session_state.selected_software
+
+    if not selected and query and len(df["Software"].iloc[filtered_pos].unique()) == 1:
+        select_software(df, filtered_pos[0])
+        selected = st.session_state.selected_software
+
+    if selected:
+        match_pos = np.asarray(name_index.get(str(selected).strip().lower(), []), dtype=np.intp)
+        detail_pos = match_pos[mask[match_pos]]
+
+        st.subheader("Details — {s}".format(s=selected))
+
+        if len(detail_pos) >= 1:
+            # Single positional row read; the sub-frame is only built for duplicate names
+            base = df.iloc[int(detail_pos[0])].to_dict()
+
+            c1, c2 = st.columns(2)
+            with c1:
+                pretty_kv("Software", base.get("Software"))
+                pretty_kv("Version", base.get("Version"))
+                pretty_kv("License", base.get("License"))
+                pretty_kv("Category", base.get("Category"))
+                pretty_kv("Vendor", base.get("Vendor"))
+            with c2:
+                pretty_kv("Platform", base.get("Platform"))
+                pretty_kv("Last Updated", base.get("Last Updated"))
+                pretty_kv("Download URL", base.get("Download URL"))
+                if download_url_ok(df_key, df)[detail_pos[0]]:
+                    link_button("⬇️ Download", cell_text(base.get("Download URL")).strip(), use_container_width=True)
+                else:
+                    st.warning("No valid Download URL found.")
+
+            desc = cell_text(base.get("Description"))
+            if str(desc).strip():
+                st.markdown("**Description**")
+                st.info(str(desc))
+
+            if len(detail_pos) > 1:
+                st.markdown("**All records for {s}** ({n}):".format(s=selected, n=len(detail_pos)))
+                st.dataframe(df.iloc[detail_pos], use_container_width=True)
+        else:
+            st.info("No details found for the selected software.")
 
-selected = st.session_state.selected_software
-
-if not selected and query and len(filtered["Software"].unique()) == 1:
-    selected = filtered["Software"].iloc[0]
-    st.session_state.selected_software = selected
-
-if selected:
-    match_mask = filtered["Software"].astype(str).str.lower() == str(selected).lower()
-    detail_df = filtered[match_mask].copy()
-
-    st.subheader("Details — {s}".format(s=selected))
-
-    if len(detail_df) >= 1:
-        base = detail_df.iloc[0].to_dict()
-
-        c1, c2 = st.columns(2)
-        with c1:
-            pretty_kv("Software", base.get("Software"))
-            pretty_kv("Version", base.get("Version"))
-            pretty_kv("License", base.get("License"))
-            pretty_kv("Category", base.get("Category"))
-            pretty_kv("Vendor", base.get("Vendor"))
-        with c2:
-            pretty_kv("Platform", base.get("Platform"))
-            pretty_kv("Last Updated", base.get("Last Updated"))
-            pretty_kv("Download URL", base.get("Download URL"))
-            url = str(base.get("Download URL") or "").strip()
-            if url.lower().startswith(("http://", "https://")):
-                link_button("⬇️ Download", url, use_container_width=True)
-            else:
-                st.warning("No valid Download URL found.")
-
-        desc = base.get("Description") or ""
-        if str(desc).strip():
-            st.markdown("**Description**")
-            st.info(str(desc))
-
-        if len(detail_df) > 1:
-            st.markdown("**All records for {s}** ({n}):".format(s=selected, n=len(detail_df)))
-            st.dataframe(detail_df, use_container_width=True)
+        st.button("Clear selection", on_click=lambda: st.session_state.update({"selected_software": None}))
     else:
-        st.info("No details found for the selected software.")
+        st.info("Click **View details** on any card to see its full information here.")
 
-    st.button("Clear selection", on_click=lambda: st.session_state.update({"selected_software": None}))
-else:
-    st.info("Click **View details** on any card to see its full information here.")
+st.markdown(CARD_CSS, unsafe_allow_html=True)
+render_catalog(df, df_key)
 
 st.divider()
 meta1, meta2 = st.columns(2)
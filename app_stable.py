@@ -1,18 +1,37 @@
 # app.py — Git-backed Software Catalog
-# UI: Search (select), Details pane, and a grid of cards. Cards now show bold title with 🪩
+# UI: Search (type-ahead), Details pane, and a grid of cards. Cards now show bold title with 🪩
 # and "boxed" badges for Category / Version / License for better visibility.
 
-import io
 import re
-import base64
-from typing import Optional
+import html
+import functools
+from typing import Dict, List, Tuple
+import numpy as np
 import pandas as pd
 import streamlit as st
 
-try:
-    import requests
-except Exception:
-    requests = None
+from catalog_core import (
+    card_fields,
+    cell_text,
+    clear_source_caches,
+    download_url_ok,
+    fragment,
+    frame_key,
+    fuzzy_matches,
+    load_catalog,
+    page_positions,
+    page_records,
+    safe_rerun,
+    search_form,
+    select_software,
+    software_names,
+    table_view,
+    unique_software,
+    view_mode_radio,
+)
+
+CARD_FIELDS = ("Software", "License", "Version", "Category", "Description")
+DESCRIPTION_MAX_LEN = 120  # card descriptions longer than this are cut with "…"
 
 st.set_page_config(
     page_title="OpenSource Softwares",
@@ -24,7 +43,10 @@ st.set_page_config(
 # ----------------------------
 # CSS — card title + boxes/badges styling
 # ----------------------------
-st.markdown(
+# Built once at import with the layout whitespace collapsed, so each rerun sends a compact element
+CARD_CSS = re.sub(
+    r"\s*\n\s*",
+    "",
     r"""
     <style>
       :root {
@@ -45,84 +67,110 @@ st.markdown(
       .badge-value { font-size: .88rem; font-weight: 600; color: var(--chip-fg); }
 
       .desc { color: var(--fg); font-size: .90rem; }
+
+      .card-grid { display: grid; grid-template-columns: repeat(var(--cols), minmax(0, 1fr)); gap: 1rem; }
+      .card { border: 1px solid var(--line); border-radius: 10px; padding: .75rem; height: 100%; }
       .divider { height: 1px; background: var(--line); margin: .5rem 0; }
 
       /* Details pane header */
       .detail-title { font-weight: 800; font-size: 1.15rem; margin: 0 0 .5rem 0; }
     </style>
     """,
-    unsafe_allow_html=True,
 )
-
-# ----------------------------
-# Rerun helper
-# ----------------------------
-
-def safe_rerun(scope: str = "app"):
-    try:
-        st.rerun(scope=scope)
-    except Exception:
-        try:
-            st.experimental_rerun()
-        except Exception:
-            pass
+st.markdown(CARD_CSS, unsafe_allow_html=True)
 
 # ----------------------------
 # Helpers
 # ----------------------------
 
-def normalize_col(name: str) -> str:
-    return re.sub(r"\s+", " ", str(name).strip().lower())
 
+def pretty_kv(label: str, value):
+    st.markdown(f"**{label}:** {value if pd.notna(value) else '-'}")
 
-def coerce_to_software_column(df: pd.DataFrame) -> pd.DataFrame:
-    norm_map = {normalize_col(c): c for c in df.columns}
-    if "software" in norm_map:
-        orig = norm_map["software"]
-        if orig != "Software":
-            df = df.rename(columns={orig: "Software"})
-        return df
-    if "component" in norm_map:
-        return df.rename(columns={norm_map["component"]: "Software"})
-    for key in ["name", "item", "asset", "module", "service", "application", "app name", "product"]:
-        if key in norm_map:
-            return df.rename(columns={norm_map[key]: "Software"})
-    return df
 
+@functools.lru_cache(maxsize=512)
+def box_row_html(category: str, version: str, license_val: str) -> str:
+    # Category/Version/License combinations repeat across cards, so most calls are cache hits
+    boxes = "".join(
+        f"<div class='badge-box'><span class='badge-label'>{label}</span>"
+        f"<span class='badge-value'>{html.escape(value)}</span></div>"
+        for label, value in (("Category", category), ("Version", version), ("License", license_val))
+    )
+    return f"<div class='box-row'>{boxes}</div>"
+
+
+def card_html(row: dict) -> str:
+    # Title line (🪩 + bold name), Category/Version/License boxes and a short description, all
+    # from card_fields() strings that need no further formatting
+    parts = [
+        "<div class='card'>",
+        f"<div class='card-title'><span class='disco'>🪩</span><strong>{html.escape(row['Software'])}</strong></div>",
+        box_row_html(row["Category"], row["Version"], row["License"]),
+    ]
+    if row["Description"]:
+        parts.append(f"<div class='desc'>{html.escape(row['Description'])}</div>")
+    parts.append("</div>")
+    return "".join(parts)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def card_rows(grid_key: tuple, _fields: Dict[str, np.ndarray], _positions: np.ndarray, n_cols: int) -> List[Tuple[str, List[int]]]:
+    """One markdown string and the row positions of its Details buttons for each row of one page
+    of cards, rebuilt only when ``grid_key`` changes."""
+    rows = page_records(_fields, _positions)
+    out = []
+    for i in range(0, len(rows), n_cols):
+        chunk = rows[i:i+n_cols]
+        cards = "".join(card_html(row) for _, row in chunk)
+        out.append((
+            f"<div class='card-grid' style='--cols:{n_cols}'>{cards}</div>",
+            [pos for pos, _ in chunk],
+        ))
+    return out
+
+
+@st.cache_resource(show_spinner=False, max_entries=12)
+def compute_catalog(df_key: str, license_filter: str, _df: pd.DataFrame) -> dict:
+    """Row positions (already in name order), sorted unique names (and their lowercase forms) for a
+    license filter, computed once per data load and handed out as-is, so callers must not mutate it."""
+    if "License" in _df.columns and license_filter in ("Free", "Paid"):
+        lic = _df["License"]
+        if isinstance(lic.dtype, pd.CategoricalDtype):
+            # Compare the handful of categories, then map through the codes (-1 = missing -> False)
+            hit = np.append(np.asarray(lic.cat.categories.str.lower() == license_filter.lower()), False)
+            keep = hit[lic.cat.codes.to_numpy()]
+        else:
+            keep = (lic.astype(str).str.lower() == license_filter.lower()).to_numpy(dtype=bool)
+    else:
+        keep = np.ones(len(_df), dtype=bool)
+    # The license mask is applied once, to the one column the names need, not the whole frame
+    names = unique_software(_df["Software"][keep])
+    return {
+        "list_pos": np.flatnonzero(keep),
+        "names": names,
+        "names_lower": np.char.lower(np.array(names, dtype=str)),
+    }
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def get_suggestions(df_key: str, license_filter: str, query: str, _names: List[str], _names_lower: np.ndarray, limit: int = 20) -> List[str]:
+    # Memoized per (data load, license filter, query), which determine `_names`: reruns that keep
+    # the query (paging, opening details) skip the scan and the fuzzy fallback.
+    # One vectorized find over the lowercase names; prefix hits (position 0) rank first,
+    # then earlier matches. Ties keep the alphabetical order of `names`.
+    names, names_lower = _names, _names_lower
+    pos = np.char.find(names_lower, query.lower())
+    hits = np.flatnonzero(pos >= 0)
+    if not hits.size:
+        return [names[i] for i in fuzzy_matches(names_lower, query, limit=limit)]
+    order = hits[np.argsort(pos[hits], kind="stable")]
+    return [names[i] for i in order[:limit]]
 
-def pretty_kv(label: str, value):
-    st.markdown(f"**{label}:** {value if pd.notna(value) else '-'}")
 
 # ----------------------------
-# Data loading from Git (secrets)
+# Data source
 # ----------------------------
 
-@st.cache_data(ttl=300, show_spinner=True)
-def load_excel_from_public_url(url: str, headers: Optional[dict] = None) -> pd.DataFrame:
-    if requests is None:
-        raise RuntimeError("The 'requests' package is required. Add it to requirements.txt.")
-    r = requests.get(url, headers=headers or {}, timeout=30)
-    r.raise_for_status()
-    return pd.read_excel(io.BytesIO(r.content), dtype=object)
-
-
-@st.cache_data(ttl=300, show_spinner=True)
-def load_excel_from_github_api(owner: str, repo: str, path: str, ref: Optional[str] = None, token: Optional[str] = None) -> pd.DataFrame:
-    if requests is None:
-        raise RuntimeError("The 'requests' package is required. Add it to requirements.txt.")
-    api_url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
-    params = {"ref": ref} if ref else None
-    headers = {"Accept": "application/vnd.github.v3+json"}
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-    resp = requests.get(api_url, headers=headers, params=params, timeout=30)
-    resp.raise_for_status()
-    data = resp.json()
-    if isinstance(data, dict) and data.get("encoding") == "base64" and data.get("content"):
-        b = base64.b64decode(data["content"])
-        return pd.read_excel(io.BytesIO(b), dtype=object)
-    raise RuntimeError("Unexpected GitHub API response. Ensure the path points to a file.")
-
 # Determine data source from secrets
 DATA_SOURCE = None
 err_msg = None
@@ -154,7 +202,7 @@ with st.sidebar:
     st.header("⚙️ Settings")
     st.caption("Data is loaded from Git (secrets). Use Refresh to re-fetch and clear cache.")
     if st.button("🔄 Refresh data", use_container_width=True):
-        st.cache_data.clear()
+        clear_source_caches()
         safe_rerun()
     st.divider()
     st.markdown("**Configured Source**")
@@ -179,16 +227,16 @@ if DATA_SOURCE is not None:
             url = DATA_SOURCE[1]
             token = DATA_SOURCE[2]
             headers = {"Authorization": f"Bearer {token}"} if token else None
-            df = load_excel_from_public_url(url, headers=headers)
+            df = load_catalog("url", {"url": url, "headers": headers})
         else:
             cfg = DATA_SOURCE[1]
-            df = load_excel_from_github_api(
-                owner=cfg["owner"],
-                repo=cfg["repo"],
-                path=cfg["path"],
-                ref=cfg.get("ref"),
-                token=cfg.get("token"),
-            )
+            df = load_catalog("github_api", {
+                "owner": cfg["owner"],
+                "repo": cfg["repo"],
+                "path": cfg["path"],
+                "ref": cfg.get("ref"),
+                "token": cfg.get("token"),
+            })
     except Exception as e:
         load_error = str(e)
 else:
@@ -198,16 +246,12 @@ if load_error:
     st.error(f"Failed to load Excel from Git: {load_error}")
     st.stop()
 
-# Normalize / coerce Software column
-
-df.columns = [str(c).strip() for c in df.columns]
-df = coerce_to_software_column(df)
+# Headers are stripped and the Software column coerced when the workbook is parsed
 if "Software" not in df.columns:
     st.error("No identifying column found. Please include a column named 'Software' (or 'Component').")
     st.stop()
 
-for col in df.columns:
-    df[col] = df[col].astype(object)
+df_key = frame_key(df)
 
 # Keep selection state
 if "selected_software" not in st.session_state:
@@ -216,155 +260,145 @@ if "license_filter" not in st.session_state:
     st.session_state.license_filter = "All"
 
 # ----------------------------
-# TOP BAR: Selectbox as search bar + Details pane
+# Search, details and grid
 # ----------------------------
 
-left, right = st.columns([1, 1], gap="large")
 
-with left:
-    st.subheader("OpenSource Softwares")
-
-    # Options for the selectbox (license-filtered first)
-    list_df = df.copy()
-    lic = st.session_state.license_filter
-    if "License" in list_df.columns and lic in ("Free", "Paid"):
-        list_df = list_df[list_df["License"].astype(str).str.lower() == lic.lower()]
-
-    names = (
-        list_df["Software"].dropna().astype(str).map(str.strip)
-        .replace("", pd.NA).dropna().drop_duplicates()
-        .sort_values(kind="mergesort").tolist()
-    )
-
-    SELECT_PLACEHOLDER = "select"
-    st.markdown("\n", unsafe_allow_html=True)
-    choice = st.selectbox(
-        "Search or pick an open‑source software (type to filter)…",
-        options=[SELECT_PLACEHOLDER] + names,
-        index=0,
-        key="search_bar",
-    )
-    st.markdown("\n", unsafe_allow_html=True)
-
-    if choice != SELECT_PLACEHOLDER:
-        st.session_state.selected_software = choice
+def show_all():
+    st.session_state.selected_software = None
+    st.session_state.pop("search_bar", None)
+    st.session_state.pop("search_pick", None)
+
+
+@fragment
+def render_catalog(df: pd.DataFrame, df_key: str):
+    """Search bar, details pane and grid, run as a fragment: their widgets rerun just this
+    function, never the load above."""
+    _, name_index = software_names(df_key, df)
+
+    # Top bar: search + details pane
+    left, right = st.columns([1, 1], gap="large")
+
+    with left:
+        st.subheader("OpenSource Softwares")
+
+        # Rows and names for the current license filter, cached per data load
+        lic = st.session_state.license_filter
+        catalog = compute_catalog(df_key, lic, df)
+        names = catalog["names"]
+
+        st.markdown("\n", unsafe_allow_html=True)
+        query = search_form("Search an open‑source software (type to filter)…", key="search_bar")
+        if query:
+            # Server-side filtering: only the top matches reach the browser, not the whole catalog
+            matches = get_suggestions(df_key, lic, query, names, catalog["names_lower"])
+            if matches:
+                st.radio(
+                    "Matches",
+                    matches,
+                    index=None,
+                    key="search_pick",
+                    label_visibility="collapsed",
+                    on_change=lambda: st.session_state.update({"selected_software": st.session_state.search_pick}),
+                )
+            else:
+                st.caption("No matching software.")
+        st.markdown("\n", unsafe_allow_html=True)
 
-    if st.session_state.selected_software:
-        if st.button("← Show all softwares", type="secondary", use_container_width=True):
-            st.session_state.selected_software = None
-            st.session_state.pop("search_bar", None)
-            safe_rerun()
+        if st.session_state.selected_software:
+            st.button("← Show all softwares", type="secondary", use_container_width=True, on_click=show_all)
 
-    # Filter for grid
-    if st.session_state.selected_software:
-        filtered = df[df["Software"].astype(str).str.lower() == st.session_state.selected_software.lower()].copy()
-    else:
-        filtered = list_df.copy()
-    filtered = filtered.sort_values(by="Software", kind="mergesort")
-
-with right:
-    st.subheader("Details")
-    selected = st.session_state.selected_software
-    if selected:
-        match_mask = df["Software"].astype(str).str.lower() == str(selected).lower()
-        detail_df = df[match_mask].copy()
-        if not detail_df.empty:
-            base = detail_df.iloc[0].to_dict()
-
-            # Title with 🪩 and bold
-            st.markdown(
-                f"<div class='detail-title'><span class='disco'>🪩</span><strong>{base.get('Software','')}</strong></div>",
-                unsafe_allow_html=True,
-            )
-            # Boxed info row
-            st.markdown(
-                f"""
-                <div class='box-row'>
-                  <div class='badge-box'><span class='badge-label'>Category</span><span class='badge-value'>{base.get('Category','-')}</span></div>
-                  <div class='badge-box'><span class='badge-label'>Version</span><span class='badge-value'>{base.get('Version','-')}</span></div>
-                  <div class='badge-box'><span class='badge-label'>License</span><span class='badge-value'>{base.get('License','-')}</span></div>
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
-
-            # Download
-            url = str(base.get("Download URL") or "").strip()
-            if url.lower().startswith(("http://", "https://")):
-                try:
-                    st.link_button("⬇️ Download", url, use_container_width=True)
-                except Exception:
-                    st.markdown(f"[⬇️ Download]({url})", unsafe_allow_html=True)
+        # Filter for grid
+        if st.session_state.selected_software:
+            filtered_pos = np.asarray(name_index.get(st.session_state.selected_software.strip().lower(), []), dtype=np.intp)
+        else:
+            # Cached positions, already in name order: no copy or re-sort
+            filtered_pos = catalog["list_pos"]
+
+    with right:
+        st.subheader("Details")
+        selected = st.session_state.selected_software
+        if selected:
+            # With a selection, the grid positions are exactly its rows: reuse them, no second lookup
+            if len(filtered_pos):
+                base = df.iloc[filtered_pos[0]].to_dict()
+
+                # Title with 🪩 and bold
+                st.markdown(
+                    f"<div class='detail-title'><span class='disco'>🪩</span><strong>{html.escape(cell_text(base.get('Software')))}</strong></div>",
+                    unsafe_allow_html=True,
+                )
+                # Boxed info row
+                st.markdown(
+                    box_row_html(
+                        cell_text(base.get("Category"), "-"),
+                        cell_text(base.get("Version"), "-"),
+                        cell_text(base.get("License"), "-"),
+                    ),
+                    unsafe_allow_html=True,
+                )
+
+                # Download
+                if download_url_ok(df_key, df)[filtered_pos[0]]:
+                    url = cell_text(base.get("Download URL")).strip()
+                    try:
+                        st.link_button("⬇️ Download", url, use_container_width=True)
+                    except Exception:
+                        st.markdown(f"[⬇️ Download]({url})", unsafe_allow_html=True)
+                else:
+                    st.warning("No valid Download URL found.")
+
+                desc = cell_text(base.get("Description"))
+                if str(desc).strip():
+                    st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
+                    st.markdown("**Description**")
+                    st.info(str(desc))
             else:
-                st.warning("No valid Download URL found.")
-
-            desc = base.get("Description") or ""
-            if str(desc).strip():
-                st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
-                st.markdown("**Description**")
-                st.info(str(desc))
+                st.info("No details found for the selected software.")
         else:
-            st.info("No details found for the selected software.")
-    else:
-        st.caption("Pick a software from the search bar to see details here.")
-
-# ----------------------------
-# GRID of cards (scrolls)
-# ----------------------------
-
-with st.expander("", expanded=True):
-    st.caption(f"Showing {len(filtered)} of {len(df)} software")
-    n_cols = 5
-    rows_iter = list(filtered.iterrows())
-
-    for i in range(0, len(rows_iter), n_cols):
-        chunk = rows_iter[i:i+n_cols]
-        cols = st.columns(len(chunk), gap="small")
-        for col_idx, (idx, row) in enumerate(chunk):
-            with cols[col_idx]:
-                try:
-                    cont = st.container(border=True)
-                except TypeError:
-                    cont = st.container()
-                with cont:
-                    title = str(row.get("Software", "—"))
-                    license_val = str(row.get("License", "—"))
-                    version_val = str(row.get("Version", "—"))
-                    category = str(row.get("Category", "—"))
-                    desc = str(row.get("Description", "") or "")
-
-                    # Title line: 🪩 + bold software name
-                    st.markdown(
-                        f"<div class='card-title'><span class='disco'>🪩</span><strong>{title}</strong></div>",
-                        unsafe_allow_html=True,
-                    )
-
-                    # Box row with Category / Version / License
-                    st.markdown(
-                        f"""
-                        <div class='box-row'>
-                          <div class='badge-box'><span class='badge-label'>Category</span><span class='badge-value'>{category}</span></div>
-                          <div class='badge-box'><span class='badge-label'>Version</span><span class='badge-value'>{version_val}</span></div>
-                          <div class='badge-box'><span class='badge-label'>License</span><span class='badge-value'>{license_val}</span></div>
-                        </div>
-                        """,
-                        unsafe_allow_html=True,
-                    )
-
-                    # Optional short description
-                    if desc.strip():
-                        short = desc if len(desc) <= 120 else (desc[:120] + "…")
-                        st.markdown(f"<div class='desc'>{short}</div>", unsafe_allow_html=True)
-
-                    if st.button("Details", key=f"view_{idx}", use_container_width=True):
-                        st.session_state.selected_software = title
-                        safe_rerun()
-
-    # Footer
-    st.divider()
-    c1, c2 = st.columns(2)
-    with c1:
-        st.caption(f"**Rows:** {len(df)}")
-    with c2:
-        if DATA_SOURCE is not None:
-            st.caption("**Source:** URL" if DATA_SOURCE[0] == "url" else "**Source:** GitHub API")
+            st.caption("Pick a software from the search bar to see details here.")
+
+    # Grid of cards (scrolls)
+
+    with st.expander("", expanded=True):
+        st.caption(f"Showing {len(filtered_pos)} of {len(df)} software")
+        if view_mode_radio(len(filtered_pos)) == "Table":
+            pick = table_view(df, df_key, filtered_pos)
+            if pick:
+                st.session_state.selected_software = pick
+                # The details pane above already ran this pass: rerun the fragment to show the pick
+                safe_rerun("fragment")
+        else:
+            n_cols = 5
+            page, page_pos = page_positions(filtered_pos, results=(lic, st.session_state.selected_software))
+            # The page's rows depend only on the data, license filter, selection and page number;
+            # reruns that change none of these (search typing, details pane) reuse the markup
+            grid_key = (df_key, lic, st.session_state.selected_software, page)
+            fields = card_fields(df_key, df, CARD_FIELDS, DESCRIPTION_MAX_LEN)
+
+            for row_markup, buttons in card_rows(grid_key, fields, page_pos, n_cols):
+                st.markdown(row_markup, unsafe_allow_html=True)
+                cols = st.columns(n_cols, gap="small")
+                for col, pos in zip(cols, buttons):
+                    with col:
+                        # Selecting in a callback lets the details pane above pick it up in
+                        # the same fragment run, with no second rerun
+                        st.button(
+                            "Details",
+                            key=f"view_{page}_{pos}",
+                            use_container_width=True,
+                            on_click=select_software,
+                            args=(df, pos),
+                        )
+
+        # Footer
+        st.divider()
+        c1, c2 = st.columns(2)
+        with c1:
+            st.caption(f"**Rows:** {len(df)}")
+        with c2:
+            if DATA_SOURCE is not None:
+                st.caption("**Source:** URL" if DATA_SOURCE[0] == "url" else "**Source:** GitHub API")
+
+
+render_catalog(df, df_key)
@@ -0,0 +1,568 @@
+# catalog_core.py — data loading and helpers shared by app.py and app_stable.py
+# Both UIs import from here, so each cached loader exists once per process and the two
+# apps share one parsed catalog instead of keeping a copy per module.
+
+import io
+import os
+import re
+import hashlib
+import importlib.util
+import functools
+import math
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+
+# `requests` itself is imported inside http_session(): reruns served from cache never need it
+HAVE_REQUESTS = importlib.util.find_spec("requests") is not None
+
+try:
+    import python_calamine  # noqa: F401  (Rust xlsx reader used by pandas' "calamine" engine)
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = "openpyxl"
+
+try:
+    from rapidfuzz import fuzz, process  # optional: typo-tolerant search fallback
+except ImportError:
+    process = None
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+BLOB_OID_QUERY = """
+query($owner: String!, $name: String!, $ref: String!, $expr: String!) {
+  repository(owner: $owner, name: $name) {
+    commit: object(expression: $ref) { oid }
+    blob: object(expression: $expr) { ... on Blob { oid byteSize } }
+  }
+}
+"""
+
+PAGE_SIZE = 30  # cards rendered per page
+TABLE_COLUMNS = ["Software", "Category", "Version", "License", "Download URL"]
+CARDS_MAX_ROWS = 50  # larger result sets open in the table view by default
+KEEP_COLUMNS = [
+    "Software", "Version", "License", "Category", "Vendor", "Platform", "Last Updated", "Download URL", "Description",
+]  # everything the UI shows
+SOFTWARE_ALIASES = [
+    "software", "component", "name", "item", "asset", "module", "service", "application", "app name", "product",
+]  # normalized headers accepted as the Software column, in priority order
+CATEGORY_COLUMNS = ["License", "Category", "Platform"]  # low-cardinality labels stored as category
+DISK_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")  # parsed catalogs as Parquet
+
+
+# ----------------------------
+# Rerun helper
+# ----------------------------
+
+# st.fragment is 1.37+; 1.33-1.36 ship it as experimental_fragment. Without either, the
+# decorated UI just reruns together with the rest of the script
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+
+def safe_rerun(scope: str = "app"):
+    """Call st.rerun if available; fall back to st.experimental_rerun for old versions."""
+    try:
+        st.rerun(scope=scope)
+    except Exception:
+        if scope != "app":
+            # Fragment-scoped reruns are only allowed during a fragment rerun
+            return safe_rerun()
+        try:
+            st.experimental_rerun()
+        except Exception:
+            pass
+
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_col(name: str) -> str:
+    return _WS_RE.sub(" ", str(name).strip().lower())
+
+
+@functools.lru_cache(maxsize=8)
+def _find_software_col(cols: Tuple[str, ...]) -> Optional[str]:
+    # The header row is the same on every rerun, so the lookup runs once per layout
+    norm_map = {normalize_col(c): c for c in cols}
+    for key in SOFTWARE_ALIASES:
+        if key in norm_map:
+            return norm_map[key]
+    return None
+
+
+def coerce_to_software_column(df: pd.DataFrame) -> pd.DataFrame:
+    orig = _find_software_col(tuple(df.columns))
+    if orig is None or orig == "Software":
+        return df
+    return df.rename(columns={orig: "Software"})
+
+
+def cell_text(value, default: str = "") -> str:
+    # Missing cells are pd.NA with string dtypes, which can't be used with `or`
+    return default if value is None or pd.isna(value) else str(value)
+
+
+def unique_software(software: pd.Series) -> List[str]:
+    # Arrow string kernels strip, filter blanks, dedupe and sort with no per-element Python
+    names = software.dropna().astype("string[pyarrow]").str.strip()
+    return names[names.ne("")].drop_duplicates().sort_values(kind="mergesort").tolist()
+
+
+def fuzzy_matches(names_lower, query: str, limit: int = 20, score_cutoff: int = 60) -> List[int]:
+    # Typo-tolerant fallback for when the substring match finds nothing; positions, best first
+    if process is None or not query:
+        return []
+    hits = process.extract(query.lower(), names_lower, scorer=fuzz.WRatio, limit=limit, score_cutoff=score_cutoff)
+    return [i for _, _, i in hits]
+
+
+def search_form(label: str, key: Optional[str] = None) -> str:
+    # Inside a form, editing the box (or leaving it) does not rerun; only Enter / Search does
+    with st.form("search_form", border=False):
+        query = st.text_input(label, placeholder="e.g., editor, vpn, browser …", key=key)
+        st.form_submit_button("Search")
+    return query.strip()
+
+
+def view_mode_radio(n_results: int) -> str:
+    if "view_mode" not in st.session_state:
+        # Large catalogs start in the virtualized table; the user can still switch to cards
+        st.session_state.view_mode = "Table" if n_results > CARDS_MAX_ROWS else "Cards"
+    return st.radio("View", ["Cards", "Table"], horizontal=True, key="view_mode")
+
+
+def page_selector(n_pages: int, key: str = "card_page", results=None) -> int:
+    """Prev / page number / Next controls; returns the 1-based page to render.
+
+    ``results`` identifies the result set being paged (the query, filter, ...); when it changes
+    the selector starts over from page 1.
+    """
+    new_results = st.session_state.get(f"{key}_results") != results
+    st.session_state[f"{key}_results"] = results
+    if n_pages <= 1:
+        return 1
+    page = st.session_state.get(key, 1)
+    if new_results or not 1 <= page <= n_pages:
+        # A new search or filter, or the result set shrank: start over from the first page
+        page = 1
+    st.session_state[key] = page
+
+    def step(delta: int):
+        st.session_state[key] = min(n_pages, max(1, st.session_state[key] + delta))
+
+    prev_col, num_col, next_col = st.columns([1, 2, 1])
+    with prev_col:
+        st.button("◀ Prev", on_click=step, args=(-1,), disabled=page <= 1, use_container_width=True)
+    with num_col:
+        st.number_input("Page", min_value=1, max_value=n_pages, step=1, key=key, label_visibility="collapsed")
+    with next_col:
+        st.button("Next ▶", on_click=step, args=(1,), disabled=page >= n_pages, use_container_width=True)
+    return int(st.session_state[key])
+
+
+def page_positions(positions: np.ndarray, results=None, key: str = "card_page") -> Tuple[int, np.ndarray]:
+    # Only one page of cards is rendered, so the widget count per rerun stays bounded by PAGE_SIZE
+    page = page_selector(max(1, math.ceil(len(positions) / PAGE_SIZE)), key=key, results=results)
+    return page, positions[(page - 1) * PAGE_SIZE : page * PAGE_SIZE]
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def download_url_ok(df_key: str, _df: pd.DataFrame) -> np.ndarray:
+    """Per-row flag for an http(s) Download URL, checked once per data load in one regex pass."""
+    if "Download URL" not in _df.columns:
+        return np.zeros(len(_df), dtype=bool)
+    urls = _df["Download URL"].astype("string[pyarrow]").str.strip()
+    return urls.str.match(r"https?://", case=False, na=False).to_numpy(dtype=bool)
+
+
+def table_rows(df: pd.DataFrame, df_key: str, positions: np.ndarray) -> pd.DataFrame:
+    # One positional take of just the table's columns; the other columns are never copied
+    cols = [df.columns.get_loc(c) for c in TABLE_COLUMNS if c in df.columns]
+    rows = df.iloc[positions, cols]
+    if "Download URL" in rows.columns:
+        ok = download_url_ok(df_key, df)[positions]
+        if not ok.all():
+            # Same rule as the details pane: only http(s) URLs become Download links
+            rows = rows.assign(**{"Download URL": rows["Download URL"].where(ok)})
+    return rows
+
+
+def table_view(df: pd.DataFrame, df_key: str, positions: np.ndarray) -> Optional[str]:
+    """Selectable table of the given rows; returns the Software name of a newly picked row.
+
+    A pick that is still highlighted from an earlier run is not returned again, so clearing
+    the selection elsewhere is not undone by the table.
+    """
+    # One Arrow-serialized, frontend-virtualized widget instead of a button per card
+    view_df = table_rows(df, df_key, positions)
+    event = st.dataframe(
+        view_df,
+        column_config={"Download URL": st.column_config.LinkColumn("Download", display_text="Download")},
+        on_select="rerun",
+        selection_mode="single-row",
+        hide_index=True,
+        use_container_width=True,
+    )
+    picked = [str(view_df["Software"].iloc[r]).strip() for r in event.selection.rows]
+    pick = picked[0] if picked else None
+    is_new_pick = pick is not None and pick != st.session_state.get("table_pick")
+    st.session_state.table_pick = pick
+    return pick if is_new_pick else None
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def card_fields(df_key: str, _df: pd.DataFrame, fields: Tuple[str, ...], max_len: int) -> Dict[str, np.ndarray]:
+    """Display strings for the given card fields (missing cells filled, descriptions trimmed and
+    cut to ``max_len``), formatted once per data load with vectorized string ops. Read-only."""
+    def text(col: str, default: str) -> pd.Series:
+        if col not in _df.columns:
+            return pd.Series(default, index=_df.index, dtype="string[pyarrow]")
+        return _df[col].astype("string[pyarrow]").fillna(default)
+
+    out = {c: text(c, "—") for c in fields if c != "Description"}
+    desc = text("Description", "").str.strip()
+    out["Description"] = desc.where(desc.str.len() <= max_len, desc.str.slice(0, max_len) + "…")
+    return {c: values.to_numpy(dtype=object) for c, values in out.items()}
+
+
+def page_records(fields: Dict[str, np.ndarray], positions: np.ndarray) -> List[Tuple[int, dict]]:
+    # Column-wise gather of one page: no per-row Series (iterrows) and no per-cell formatting
+    names = list(fields)
+    columns = [fields[f][positions] for f in names]
+    return [(pos, dict(zip(names, values))) for pos, values in zip(positions.tolist(), zip(*columns))]
+
+
+def frame_key(df: pd.DataFrame) -> str:
+    # Cached helpers take the frame as an unhashed `_df`. Parsed catalogs carry the workbook's
+    # content hash; anything else is hashed in C
+    if df.attrs.get("content_key"):
+        return df.attrs["content_key"]
+    return hashlib.md5(pd.util.hash_pandas_object(df, index=False).values).hexdigest()
+
+
+def build_name_index(names_lower: np.ndarray) -> Dict[str, List[int]]:
+    # Lowercased name -> row positions, so selecting a software is a dict lookup, not a scan
+    index: Dict[str, List[int]] = {}
+    for pos, name in enumerate(names_lower.tolist()):
+        index.setdefault(name, []).append(pos)
+    return index
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def software_names(df_key: str, _df: pd.DataFrame) -> Tuple[pa.Array, Dict[str, List[int]]]:
+    """Stripped, lowercased Software names (as Arrow, for the search kernel) plus a name -> row
+    positions index, computed once per data load. Shared across reruns without a copy: read-only."""
+    software_lower = np.char.lower(_df["Software"].astype(str).str.strip().to_numpy(dtype=str))
+    return pa.array(software_lower), build_name_index(software_lower)
+
+
+def select_software(df: pd.DataFrame, pos: int):
+    # By row position: a card's title is the "—" placeholder for a missing name, which the name
+    # index (keyed by the cell's own text, as the table pick is) would never match
+    st.session_state.selected_software = str(df["Software"].iloc[pos]).strip()
+
+
+# ----------------------------
+# Data loading from Git
+# ----------------------------
+
+@st.cache_resource(show_spinner=False)
+def http_session() -> "requests.Session":
+    # One pooled keep-alive session per process: refreshes reuse the TLS connection
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.request import ACCEPT_ENCODING
+    from urllib3.util.retry import Retry
+
+    s = requests.Session()
+    # Transient GitHub/CDN failures (429, 5xx) are retried with backoff instead of failing the load
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    # gzip/deflate, plus br/zstd only when brotli/zstandard are installed to decode them
+    s.headers.update({"Accept-Encoding": ACCEPT_ENCODING})
+    return s
+
+
+@st.cache_resource(show_spinner=False)
+def _response_store() -> dict:
+    # GET key -> (ETag, Last-Modified, body) of the last 200 response
+    return {}
+
+
+def conditional_get(url: str, headers: Optional[dict] = None, params: Optional[dict] = None, timeout: int = 30) -> bytes:
+    """GET that revalidates with the stored ETag / Last-Modified and reuses the stored body on 304."""
+    store = _response_store()
+    key = (url, tuple(sorted((params or {}).items())), (headers or {}).get("Accept"))
+    headers = dict(headers or {})
+    cached = store.get(key)
+    if cached:
+        if cached[0]:
+            headers["If-None-Match"] = cached[0]
+        if cached[1]:
+            headers["If-Modified-Since"] = cached[1]
+    r = http_session().get(url, headers=headers, params=params, timeout=timeout)
+    if r.status_code == 304 and cached:
+        return cached[2]
+    r.raise_for_status()
+    etag, last_modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+    if etag or last_modified:
+        store.pop(key, None)
+        store[key] = (etag, last_modified, r.content)
+        while len(store) > 8:
+            store.pop(next(iter(store)))
+    return r.content
+
+
+def download_excel_from_public_url(url: str, headers: Optional[dict] = None) -> bytes:
+    if not HAVE_REQUESTS:
+        raise RuntimeError("The 'requests' package is required. Add it to requirements.txt.")
+    return conditional_get(url, headers=headers)
+
+
+def download_excel_from_github_api(owner: str, repo: str, path: str, ref: Optional[str] = None, token: Optional[str] = None) -> bytes:
+    if not HAVE_REQUESTS:
+        raise RuntimeError("The 'requests' package is required. Add it to requirements.txt.")
+    api_url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
+    params = {"ref": ref} if ref else None
+    # The raw media type returns the file bytes themselves (up to 100 MB): no JSON envelope,
+    # no base64 decode, and the ETag still lets conditional_get skip unchanged files
+    headers = {"Accept": "application/vnd.github.raw"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    content = conditional_get(api_url, headers=headers, params=params)
+    if content[:1] in (b"{", b"["):
+        # A directory (or other non-file) still answers with JSON
+        raise RuntimeError("Unexpected GitHub API response. Ensure the path points to a file.")
+    return content
+
+
+def download_excel_from_github_raw(owner: str, repo: str, path: str, ref: Optional[str] = None, token: Optional[str] = None) -> bytes:
+    # Raw bytes straight from the CDN: no JSON envelope, no base64 (~25% fewer bytes)
+    if not HAVE_REQUESTS:
+        raise RuntimeError("The 'requests' package is required. Add it to requirements.txt.")
+    raw_url = f"https://raw.githubusercontent.com/{owner}/{repo}/{ref or 'HEAD'}/{quote(path)}"
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    return conditional_get(raw_url, headers=headers)
+
+
+def fetch_blob_oid(owner: str, repo: str, path: str, ref: Optional[str] = None, token: Optional[str] = None) -> Optional[Tuple[str, Optional[str]]]:
+    """Blob oid of the workbook and the commit it resolved at, in one GraphQL call.
+
+    GitHub's GraphQL API requires authentication, so this returns None without a token.
+    """
+    if not HAVE_REQUESTS or not token:
+        return None
+    ref = ref or "HEAD"
+    resp = http_session().post(
+        GITHUB_GRAPHQL_URL,
+        json={"query": BLOB_OID_QUERY, "variables": {"owner": owner, "name": repo, "ref": ref, "expr": f"{ref}:{path}"}},
+        headers={"Authorization": f"Bearer {token}"},
+        timeout=10,
+    )
+    resp.raise_for_status()
+    repository = (resp.json().get("data") or {}).get("repository") or {}
+    blob = repository.get("blob") or {}
+    if not blob.get("oid"):
+        return None
+    return blob["oid"], (repository.get("commit") or {}).get("oid")
+
+
+def _wanted_column(name) -> bool:
+    # Shown columns plus any header that may become Software; the rest are never converted
+    return str(name).strip() in KEEP_COLUMNS or normalize_col(name) in SOFTWARE_ALIASES
+
+
+def read_excel_bytes(content: bytes) -> pd.DataFrame:
+    return pd.read_excel(io.BytesIO(content), dtype=object, engine=EXCEL_ENGINE, usecols=_wanted_column)
+
+
+def to_string_dtype(df: pd.DataFrame) -> pd.DataFrame:
+    # read_excel(dtype=object) only yields object columns, so one frame-wide astype converts
+    # them all, without selecting a column subset, copying it and assigning it back
+    return df.astype("string[pyarrow]")
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _parse_catalog(digest: str, _content: bytes) -> pd.DataFrame:
+    df = to_string_dtype(read_excel_bytes(_content))
+    # Header cleanup happens once per parse, not on every rerun
+    df.columns = [str(c).strip() for c in df.columns]
+    df = coerce_to_software_column(df)
+    # Other columns are skipped at read time; alias headers that lost to Software go here
+    df = df.drop(columns=[c for c in df.columns if c not in KEEP_COLUMNS])
+    if "Software" in df.columns:
+        # Rows are kept in name order (trimmed, case-insensitive) so reruns never sort; the key
+        # keeps missing names as NA, so they still sort last
+        df = df.sort_values(
+            "Software", key=lambda s: s.str.strip().str.lower(), kind="mergesort", ignore_index=True
+        )
+    return _finish_catalog(df, digest)
+
+
+def _finish_catalog(df: pd.DataFrame, content_key: str) -> pd.DataFrame:
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            # A few distinct labels over many rows: small integer codes plus one category table
+            df[col] = df[col].astype("category")
+    # Reused as the frame's cache key so reruns never re-hash the parsed rows
+    df.attrs["content_key"] = content_key
+    return df
+
+
+def parse_catalog(content: bytes) -> pd.DataFrame:
+    # Keyed by content hash: a download that comes back unchanged (HTTP 304) is not parsed again
+    return _parse_catalog(hashlib.sha1(content).hexdigest(), content)
+
+
+def _disk_cache_path(version: str, kind: str, cfg: dict) -> str:
+    # One file per source (token and headers excluded), named by the probed version
+    source = cfg["url"] if kind == "url" else f"{cfg['owner']}/{cfg['repo']}/{cfg['path']}"
+    source_key = hashlib.sha1(source.encode()).hexdigest()[:16]
+    version_key = hashlib.sha1(str(version).encode()).hexdigest()[:16]
+    return os.path.join(DISK_CACHE_DIR, f"{source_key}-{version_key}.parquet")
+
+
+def read_cached_catalog(path: str) -> Optional[pd.DataFrame]:
+    try:
+        stored = pd.read_parquet(path)
+    except Exception:
+        return None
+    # Parquet hands strings back as string[python] and categories over object: restore the parsed dtypes
+    return _finish_catalog(to_string_dtype(stored), stored.attrs.get("content_key") or os.path.basename(path))
+
+
+def write_cached_catalog(df: pd.DataFrame, path: str):
+    # Best effort: a read-only or full disk only costs the next cold start a re-parse
+    try:
+        os.makedirs(DISK_CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+        # Older versions of the same source are never read again
+        prefix = os.path.basename(path).split("-")[0] + "-"
+        for name in os.listdir(DISK_CACHE_DIR):
+            if name.startswith(prefix) and name != os.path.basename(path):
+                os.remove(os.path.join(DISK_CACHE_DIR, name))
+    except Exception:
+        pass
+
+
+@st.cache_resource(ttl=300, show_spinner=True)
+def load_excel_from_public_url(url: str, headers: Optional[dict] = None) -> pd.DataFrame:
+    return parse_catalog(download_excel_from_public_url(url, headers=headers))
+
+
+@st.cache_resource(ttl=300, show_spinner=True)
+def load_excel_from_github_api(owner: str, repo: str, path: str, ref: Optional[str] = None, token: Optional[str] = None) -> pd.DataFrame:
+    return parse_catalog(download_excel_from_github_api(owner, repo, path, ref=ref, token=token))
+
+
+@st.cache_resource(show_spinner=False)
+def _etag_store() -> dict:
+    # probe key -> (ETag, version) from the last successful probe
+    return {}
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_source_version(kind: str, cfg: dict) -> Optional[Tuple[str, Optional[str]]]:
+    """Cheap version probe returning (version, ref to download at).
+
+    GitHub: blob oid via GraphQL when a token is set, else the latest commit SHA for the
+    path via REST. URL: ETag / Last-Modified from a HEAD request.
+    """
+    if not HAVE_REQUESTS:
+        return None
+    store = _etag_store()
+    key = (kind, tuple(sorted((k, str(v)) for k, v in cfg.items())))
+    try:
+        if kind == "url":
+            r = http_session().head(cfg["url"], headers=cfg.get("headers") or {}, timeout=10, allow_redirects=True)
+            r.raise_for_status()
+            version = r.headers.get("ETag") or r.headers.get("Last-Modified")
+            return (version, None) if version else None
+        try:
+            blob = fetch_blob_oid(cfg["owner"], cfg["repo"], cfg["path"], ref=cfg.get("ref"), token=cfg.get("token"))
+        except Exception:
+            blob = None
+        if blob:
+            return blob
+        api_url = f"https://api.github.com/repos/{cfg['owner']}/{cfg['repo']}/commits"
+        params = {"path": cfg["path"], "per_page": 1}
+        if cfg.get("ref"):
+            params["sha"] = cfg["ref"]
+        headers = {"Accept": "application/vnd.github.v3+json"}
+        if cfg.get("token"):
+            headers["Authorization"] = f"Bearer {cfg['token']}"
+        cached = store.get(key)
+        if cached:
+            headers["If-None-Match"] = cached[0]
+        resp = http_session().get(api_url, headers=headers, params=params, timeout=10)
+        if resp.status_code == 304 and cached:
+            return cached[1], cached[1]
+        resp.raise_for_status()
+        commits = resp.json()
+        if not commits:
+            return None
+        sha = commits[0]["sha"]
+        if resp.headers.get("ETag"):
+            store[key] = (resp.headers["ETag"], sha)
+        return sha, sha
+    except Exception:
+        return None
+
+
+@st.cache_resource(show_spinner=True, max_entries=4)
+def get_df_by_sha(sha: str, kind: str, cfg: dict, _ref: Optional[str] = None) -> pd.DataFrame:
+    """Download and parse the workbook once per version; the frame is shared read-only by all sessions.
+
+    ``_ref`` (not part of the cache key) pins the download to the probed commit. The parsed
+    frame is also kept as Parquet on disk, so a restarted process skips download and parse.
+    """
+    path = _disk_cache_path(sha, kind, cfg)
+    df = read_cached_catalog(path)
+    if df is not None:
+        return df
+    if kind == "url":
+        content = download_excel_from_public_url(cfg["url"], headers=cfg.get("headers"))
+    else:
+        ref = _ref or cfg.get("ref")
+        try:
+            content = download_excel_from_github_raw(cfg["owner"], cfg["repo"], cfg["path"], ref=ref, token=cfg.get("token"))
+        except Exception:
+            content = download_excel_from_github_api(cfg["owner"], cfg["repo"], cfg["path"], ref=ref, token=cfg.get("token"))
+    df = parse_catalog(content)
+    write_cached_catalog(df, path)
+    return df
+
+
+def load_catalog(kind: str, cfg: dict) -> pd.DataFrame:
+    probe = fetch_source_version(kind, cfg)
+    if probe:
+        version, ref = probe
+        df = get_df_by_sha(version, kind, cfg, _ref=ref)
+    elif kind == "url":
+        # No version available (HEAD not supported, API error): plain TTL-cached download
+        df = load_excel_from_public_url(cfg["url"], headers=cfg.get("headers"))
+    else:
+        df = load_excel_from_github_api(**cfg)
+    # Cached frames are process-wide singletons: hand out a shallow copy so the
+    # caller's column or attribute changes never touch the shared object
+    return df.copy(deep=False)
+
+
+def clear_source_caches():
+    # Refresh button: drop the version probe and the TTL-cached loads. get_df_by_sha is kept, so
+    # when the re-probed version is unchanged the frame is reused without downloading or parsing
+    fetch_source_version.clear()
+    load_excel_from_public_url.clear()
+    load_excel_from_github_api.clear()